@@ -5,6 +5,10 @@ import os
 import sys
 import json
 import random
+import multiprocessing
+import re
+import fnmatch
+import ctypes
 
 # Windows-specific module (only available on Windows)
 try:
@@ -14,6 +18,23 @@ except ImportError:
     WINSOUND_AVAILABLE = False
     print("Warning: winsound not available (non-Windows system). Sound alerts disabled.")
 
+# Win32 API prototypes used to resolve the process that owns a window
+if sys.platform == 'win32':
+    from ctypes import wintypes
+    user32 = ctypes.WinDLL('user32')
+    kernel32 = ctypes.WinDLL('kernel32')
+    user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+    user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.QueryFullProcessImageNameW.argtypes = [wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)]
+    kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    WIN32_API_AVAILABLE = True
+else:
+    WIN32_API_AVAILABLE = False
+
 try:
     import pygetwindow as gw
     import pyautogui
@@ -28,7 +49,13 @@ DEFAULT_STOP_KEY = 'page down'
 DEFAULT_COUNTDOWN_SECONDS = 130
 DEFAULT_RANDOM_OFFSET_SECONDS = 0
 DEFAULT_AUTO_CLICK_WINDOWS = False
+DEFAULT_WINDOW_RULES = [{'type': 'glob', 'pattern': '*MapleRoyals*'}]
+WINDOW_RULE_TYPES = ('exact', 'glob', 'regex', 'process', 'handle')
 CONFIG_FILE = 'timer_config.json'
+ACTION_TIMEOUT_SECONDS = 5.0  # Deadline for a single window action in the worker
+WORKER_STARTUP_TIMEOUT_SECONDS = 15.0  # Worker needs time to import pyautogui
+WATCHDOG_INTERVAL_SECONDS = 10.0  # How often the watchdog pings the worker
+WATCHDOG_TIMEOUT_SECONDS = 3.0  # Ping reply deadline before the worker is restarted
 # -----------------------
 
 current_timer = None
@@ -36,6 +63,9 @@ actual_countdown = 0  # Stores the actual countdown time with random offset appl
 timer_start_time = None  # Timestamp when timer started
 progress_thread = None  # Thread for displaying progress bar
 stop_progress = False  # Flag to stop progress thread
+automation_worker = None  # AutomationWorker running window actions out of process
+auto_click_thread = None  # Thread running the current auto-click sequence
+window_matcher = None  # WindowMatcher compiled from config['window_rules']
 config = {}
 
 def get_config_path():
@@ -54,7 +84,7 @@ def load_config():
     if os.path.exists(config_path):
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                return migrate_config(json.load(f))
         except Exception as e:
             print(f"Failed to load config: {e}")
             return None
@@ -73,34 +103,176 @@ def save_config(config):
         print(f"Failed to save config: {e}")
         return False
 
-def select_windows():
-    """Let user select which MapleRoyals windows to auto-click."""
-    if not WINDOW_AUTOMATION_AVAILABLE:
+def default_window_rules():
+    """Return a fresh copy of the default window rules."""
+    return [dict(rule) for rule in DEFAULT_WINDOW_RULES]
+
+def window_rules_from_titles(selected_titles):
+    """Convert the legacy 'selected_window_titles' value into window rules."""
+    # None meant "all windows"; an empty list selected none
+    if selected_titles is None:
+        return default_window_rules()
+    return [{'type': 'exact', 'pattern': title} for title in selected_titles]
+
+def migrate_config(cfg):
+    """Fill in keys missing from older config files."""
+    # Ensure auto_click_windows exists in config (for backwards compatibility)
+    if 'auto_click_windows' not in cfg:
+        cfg['auto_click_windows'] = DEFAULT_AUTO_CLICK_WINDOWS
+
+    # Older configs stored a list of exact titles instead of window rules
+    if 'window_rules' not in cfg:
+        cfg['window_rules'] = window_rules_from_titles(cfg.get('selected_window_titles'))
+    cfg.pop('selected_window_titles', None)
+
+    if not isinstance(cfg['window_rules'], list):
+        print(f"Warning: 'window_rules' must be a list, got {cfg['window_rules']!r}. Using default rules.")
+        cfg['window_rules'] = default_window_rules()
+
+    for rule in cfg['window_rules']:
+        if not isinstance(rule, dict):
+            print(f"Warning: Ignoring window rule {rule!r}; rules must be objects like {DEFAULT_WINDOW_RULES[0]}")
+    cfg['window_rules'] = [rule for rule in cfg['window_rules'] if isinstance(rule, dict)]
+
+    return cfg
+
+def set_config(new_config):
+    """Install a new configuration and compile its window-targeting rules."""
+    global config, window_matcher
+    config = migrate_config(new_config)
+    window_matcher = WindowMatcher(config['window_rules'])
+
+def describe_window_rule(rule):
+    """Return a one-line description of a window rule for display."""
+    if not isinstance(rule, dict):
+        return repr(rule)
+    return f"{rule.get('type')}: {rule.get('pattern')}"
+
+def get_window_process_name(handle):
+    """Return the executable name that owns a window handle, or None if unavailable."""
+    if not WIN32_API_AVAILABLE:
         return None
 
-    try:
-        # Find all windows with 'MapleRoyals' in title
-        all_windows = [w for w in gw.getAllWindows() if 'MapleRoyals' in w.title]
+    pid = wintypes.DWORD()
+    if not user32.GetWindowThreadProcessId(handle, ctypes.byref(pid)):
+        return None
 
-        if not all_windows:
-            print("  No MapleRoyals windows currently running.")
-            print("  Will auto-click all MapleRoyals windows when available.")
+    # PROCESS_QUERY_LIMITED_INFORMATION
+    process = kernel32.OpenProcess(0x1000, False, pid.value)
+    if not process:
+        return None
+
+    try:
+        buffer = ctypes.create_unicode_buffer(260)
+        size = wintypes.DWORD(len(buffer))
+        if not kernel32.QueryFullProcessImageNameW(process, 0, buffer, ctypes.byref(size)):
             return None
+        return os.path.basename(buffer.value)
+    finally:
+        kernel32.CloseHandle(process)
+
+class WindowMatcher:
+    """
+    Window-targeting rules compiled once at config load.
+
+    Rules are dicts like {'type': 'glob', 'pattern': '*MapleRoyals*'}; a window
+    is targeted if any rule matches. Results are cached per window handle and
+    re-evaluated only when that window's title changes.
+    """
+
+    def __init__(self, rules):
+        self.rules = []
+        self.exact_titles = set()
+        self.process_names = set()
+        self.handles = set()
+        self.title_regexes = []
 
-        # Filter valid windows
-        valid_windows = []
+        for rule in rules or []:
+            rule_type = rule.get('type') if isinstance(rule, dict) else None
+            pattern = rule.get('pattern') if isinstance(rule, dict) else None
+
+            if rule_type not in WINDOW_RULE_TYPES or pattern is None:
+                print(f"Warning: Ignoring invalid window rule: {rule}")
+                continue
+
+            try:
+                if rule_type == 'exact':
+                    self.exact_titles.add(pattern)
+                elif rule_type == 'glob':
+                    self.title_regexes.append(re.compile(r'\A' + fnmatch.translate(pattern)))
+                elif rule_type == 'regex':
+                    self.title_regexes.append(re.compile(pattern))
+                elif rule_type == 'process':
+                    self.process_names.add(pattern.lower())
+                elif rule_type == 'handle':
+                    # Handles are usually shown in hex, so accept '0x...' strings too
+                    self.handles.add(int(pattern, 0) if isinstance(pattern, str) else int(pattern))
+            except (re.error, ValueError, TypeError, AttributeError) as e:
+                print(f"Warning: Ignoring window rule {describe_window_rule(rule)} ({e})")
+                continue
+
+            self.rules.append(rule)
+
+        self.cache = {}  # handle -> (title, matched)
+
+    def _match(self, handle, title):
+        if handle in self.handles or title in self.exact_titles:
+            return True
+        if any(regex.search(title) for regex in self.title_regexes):
+            return True
+        if self.process_names:
+            process_name = get_window_process_name(handle)
+            if process_name and process_name.lower() in self.process_names:
+                return True
+        return False
+
+    def matches(self, window):
+        """Return True if the window is targeted by any rule."""
+        handle = window._hWnd
+        title = window.title
+
+        cached = self.cache.get(handle)
+        if cached is not None and cached[0] == title:
+            return cached[1]
+
+        matched = self._match(handle, title)
+        self.cache[handle] = (title, matched)
+        return matched
+
+    def filter(self, windows):
+        """Return targeted windows, deduplicated by handle, and drop cache entries for closed windows."""
+        targeted = []
         seen_handles = set()
 
-        for w in all_windows:
+        for w in windows:
             try:
-                if w._hWnd not in seen_handles:
+                if w._hWnd in seen_handles:
+                    continue
+                seen_handles.add(w._hWnd)
+                if self.matches(w):
+                    # Try to get window rect to verify it's accessible
                     _ = w.size
-                    _ = w.title
-                    valid_windows.append(w)
-                    seen_handles.add(w._hWnd)
+                    targeted.append(w)
             except:
                 continue
 
+        for handle in set(self.cache) - seen_handles:
+            del self.cache[handle]
+
+        return targeted
+
+def select_windows():
+    """
+    Let user choose which MapleRoyals windows to auto-click.
+    Returns a list of window rules, None for the default rules, or False if cancelled.
+    """
+    if not WINDOW_AUTOMATION_AVAILABLE:
+        return None
+
+    try:
+        # Find all windows matching the default MapleRoyals rules
+        valid_windows = WindowMatcher(DEFAULT_WINDOW_RULES).filter(gw.getAllWindows())
+
         if not valid_windows:
             print("  No valid MapleRoyals windows found.")
             print("  Will auto-click all MapleRoyals windows when available.")
@@ -111,11 +283,15 @@ def select_windows():
             print(f"    [{i}] {w.title}")
 
         print("\n  Select windows to auto-click:")
-        print("    Type '/all' for all windows")
-        print("    Or enter numbers separated by commas (e.g., '1,3' or '2')")
+        print("    Type '/all' for all windows with 'MapleRoyals' in the title")
+        print("    Type '/process' to match by the game's executable name")
+        print("    Type 'glob:<pattern>' or 'regex:<pattern>' for a custom title rule")
+        print("      (e.g. 'glob:*MapleRoyals*'); these keep working when a title changes")
+        print("    Or enter numbers separated by commas (e.g., '1,3' or '2') to pin exact titles")
         print("    Press Enter to cancel: ", end='', flush=True)
 
-        selection = input().strip().lower()
+        raw_selection = input().strip()
+        selection = raw_selection.lower()
 
         if not selection:
             print("  Selection cancelled. Auto-click will be disabled.")
@@ -123,7 +299,26 @@ def select_windows():
 
         if selection == '/all':
             print(f"  Selected: All {len(valid_windows)} windows")
-            return None  # None means "all windows"
+            return None  # None means the default rules
+
+        if selection == '/process':
+            process_names = sorted({name for name in (get_window_process_name(w._hWnd) for w in valid_windows) if name})
+            if not process_names:
+                print("  Could not determine the executable name. Will auto-click all MapleRoyals windows.")
+                return None
+
+            print(f"  Selected executable(s): {', '.join(process_names)}")
+            return [{'type': 'process', 'pattern': name} for name in process_names]
+
+        for rule_type in ('glob', 'regex'):
+            if selection.startswith(rule_type + ':'):
+                rule = {'type': rule_type, 'pattern': raw_selection[len(rule_type) + 1:].strip()}
+                if not rule['pattern'] or not WindowMatcher([rule]).rules:
+                    print("  Invalid pattern. Auto-click will be disabled.")
+                    return False
+
+                print(f"  Selected rule: {describe_window_rule(rule)}")
+                return [rule]
 
         # Parse selection
         try:
@@ -144,7 +339,7 @@ def select_windows():
             for title in selected_titles:
                 print(f"    - {title}")
 
-            return selected_titles
+            return window_rules_from_titles(selected_titles)
 
         except ValueError:
             print("  Invalid input. Auto-click will be disabled.")
@@ -225,7 +420,7 @@ def setup_config():
 
     # Ask about auto-click feature
     auto_click = False
-    selected_windows = None
+    window_rules = None
 
     if WINDOW_AUTOMATION_AVAILABLE:
         print("\nAuto-click MapleRoyals windows when timer ends?")
@@ -234,11 +429,11 @@ def setup_config():
         auto_click = (auto_click_input == '/enable')
 
         if auto_click:
-            selected_windows = select_windows()
+            window_rules = select_windows()
             # If user cancelled selection, disable auto-click
-            if selected_windows is False:
+            if window_rules is False:
                 auto_click = False
-                selected_windows = None
+                window_rules = None
     else:
         print("\nNote: Auto-click feature unavailable (missing dependencies)")
 
@@ -248,70 +443,331 @@ def setup_config():
         'countdown_seconds': countdown_seconds,
         'random_offset_seconds': random_offset,
         'auto_click_windows': auto_click,
-        'selected_window_titles': selected_windows
+        'window_rules': window_rules if window_rules is not None else default_window_rules()
     }
 
-def click_maple_windows():
+def find_window_by_handle(handle):
+    """Return the window with the given handle, or None if it no longer exists."""
+    for w in gw.getAllWindows():
+        if w._hWnd == handle:
+            return w
+    return None
+
+def perform_window_action(action):
     """
-    Find and click MapleRoyals windows with human-like timing.
-    Respects user's window selection from config.
+    Activate one window and press the trigger key.
+    Runs inside the worker process. Returns a warning message or None.
     """
-    if not WINDOW_AUTOMATION_AVAILABLE:
-        print("Window automation not available")
-        return
+    warning = None
 
+    # Use mouse to activate window (more human-like and bypasses API restrictions)
     try:
-        # Find all windows with 'MapleRoyals' in title
-        all_windows = [w for w in gw.getAllWindows() if 'MapleRoyals' in w.title]
+        # Move mouse to target position with human-like animation
+        pyautogui.moveTo(action['x'], action['y'], duration=action['move_duration'])
 
-        if not all_windows:
-            print("No MapleRoyals windows found")
-            return
+        # Small pause after movement (human reaction time)
+        time.sleep(action['pause'])
 
-        # Filter out invalid windows and duplicates
-        valid_windows = []
-        seen_handles = set()
+        # Click on the position (mouse is already there)
+        pyautogui.click()
+        time.sleep(0.2)  # Wait for window to become active
+
+    except Exception:
+        # If mouse click fails, try API activate as fallback
+        try:
+            find_window_by_handle(action['handle']).activate()
+            time.sleep(0.15)
+        except:
+            warning = "Could not activate window, sent keypress anyway"
+
+    # Press the trigger key
+    keyboard.press_and_release(action['trigger_key'])
+
+    return warning
+
+def automation_worker_main(conn):
+    """
+    Worker process entry point: execute window actions received over the pipe.
+    Requests are (request_id, kind, payload); every reply starts with the request_id.
+    """
+    conn.send(('ready',))
+
+    while True:
+        try:
+            request_id, kind, payload = conn.recv()
+        except (EOFError, OSError):
+            break
 
-        for w in all_windows:
+        if kind == 'ping':
+            conn.send((request_id, 'pong'))
+        elif kind == 'action':
+            started = time.perf_counter()
             try:
-                # Check if window is valid and accessible
-                if w._hWnd not in seen_handles:
-                    # Try to get window rect to verify it's accessible
-                    _ = w.size
-                    _ = w.title  # Verify we can read title
-                    valid_windows.append(w)
-                    seen_handles.add(w._hWnd)
-            except:
-                continue
+                warning = perform_window_action(payload)
+                conn.send((request_id, True, warning, time.perf_counter() - started))
+            except Exception as e:
+                conn.send((request_id, False, str(e), time.perf_counter() - started))
+        elif kind == 'stop':
+            break
 
-        if not valid_windows:
-            print("No valid MapleRoyals windows found")
-            return
+def new_automation_stats():
+    """Return an empty latency/timeout tally for AutomationWorker.record()."""
+    return {
+        'actions': 0,
+        'failures': 0,
+        'timeouts': 0,
+        'total_latency': 0.0,
+        'max_latency': 0.0,
+        'total_worker_time': 0.0,  # Time spent inside the worker, for actions that replied
+    }
+
+def format_automation_stats(stats):
+    """Return a one-line summary of an automation stats tally."""
+    avg_latency = stats['total_latency'] / stats['actions'] if stats['actions'] else 0.0
+    replied = stats['actions'] - stats['timeouts']
+    avg_worker_time = stats['total_worker_time'] / replied if replied else 0.0
+    return (f"{stats['actions']} action(s), "
+            f"avg {avg_latency:.2f}s round-trip ({avg_worker_time:.2f}s in worker), "
+            f"max {stats['max_latency']:.2f}s, "
+            f"{stats['timeouts']} timeout(s), {stats['failures']} failure(s)")
+
+class AutomationWorker:
+    """
+    Runs window actions in a separate process so a hung pyautogui/keyboard
+    call cannot stall the caller. Each action has a deadline, and a watchdog
+    thread restarts the worker if it stops answering pings. Restarts happen
+    on a background thread; callers only ever wait up to their own deadline.
+    """
 
-        # Filter by user selection if configured
-        selected_titles = config.get('selected_window_titles')
-        print(f"\nDebug: selected_window_titles from config: {selected_titles}")
-        print(f"Debug: Type of selected_window_titles: {type(selected_titles)}")
+    def __init__(self, action_timeout=ACTION_TIMEOUT_SECONDS,
+                 watchdog_interval=WATCHDOG_INTERVAL_SECONDS,
+                 watchdog_timeout=WATCHDOG_TIMEOUT_SECONDS):
+        self.action_timeout = action_timeout
+        self.watchdog_interval = watchdog_interval
+        self.watchdog_timeout = watchdog_timeout
+        self.process = None
+        self.conn = None
+        self.lock = threading.Lock()  # One request/reply on the pipe at a time
+        self.ready = threading.Event()  # Set while a started worker accepts requests
+        self.respawn_lock = threading.Lock()  # Guards self.respawning
+        self.respawning = False
+        self.next_request_id = 0
+        self.stop_event = threading.Event()
+        self.watchdog_thread = None
+        self.totals = new_automation_stats()  # Running totals since program start
+        self.restarts = 0
+
+    def start(self):
+        """Start the worker process in the background and the watchdog thread."""
+        self.stop_event.clear()
+        self._respawn_async()
+
+        if self.watchdog_thread is None:
+            self.watchdog_thread = threading.Thread(target=self._watchdog, daemon=True)
+            self.watchdog_thread.start()
+
+    def stop(self):
+        """Stop the watchdog and shut the worker process down."""
+        self.stop_event.set()
+        self.ready.clear()
+        with self.lock:
+            process, conn = self.process, self.conn
+            self.process, self.conn = None, None
+        if conn is not None:
+            try:
+                conn.send((0, 'stop', None))
+            except (OSError, ValueError):
+                pass
+        self._kill(process, conn)
+
+    def _kill(self, process, conn):
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout=1.0)
+        if conn is not None:
+            conn.close()
+
+    def _respawn_async(self, reason=None):
+        """Replace the worker process on a background thread; no-op if one is already running."""
+        with self.respawn_lock:
+            if self.respawning or self.stop_event.is_set():
+                return
+            self.respawning = True
 
-        if selected_titles is not None:
-            # User has selected specific windows
-            print(f"Debug: Filtering {len(valid_windows)} windows by {len(selected_titles)} selected titles")
-            windows = [w for w in valid_windows if w.title in selected_titles]
+        self.ready.clear()
+        if reason:
+            print(f"\nAutomation worker {reason}, restarting in background...")
+            self.restarts += 1
+        threading.Thread(target=self._respawn, daemon=True).start()
 
-            if not windows:
-                print(f"None of the selected windows are currently running.")
-                print(f"Selected windows: {', '.join(selected_titles)}")
+    def _respawn(self):
+        try:
+            # Detach the old worker; waits only for an in-flight request, which is bounded by its deadline
+            with self.lock:
+                old_process, old_conn = self.process, self.conn
+                self.process, self.conn = None, None
+            self._kill(old_process, old_conn)
+
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=automation_worker_main, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+
+            # Wait for the worker to finish importing before handing it to callers
+            try:
+                started = parent_conn.poll(WORKER_STARTUP_TIMEOUT_SECONDS) and parent_conn.recv() == ('ready',)
+            except (EOFError, OSError):
+                started = False
+
+            if not started or self.stop_event.is_set():
+                if not self.stop_event.is_set():
+                    print("\nWarning: Automation worker did not start in time; will retry")
+                self._kill(process, parent_conn)
                 return
 
-            print(f"\nFound {len(windows)} of {len(selected_titles)} selected window(s)")
-            not_found = set(selected_titles) - {w.title for w in windows}
-            if not_found:
-                print(f"Not running: {', '.join(not_found)}")
+            with self.lock:
+                self.process, self.conn = process, parent_conn
+            self.ready.set()
+        finally:
+            with self.respawn_lock:
+                self.respawning = False
+
+    def _exchange(self, kind, payload, deadline):
+        """
+        Send a request and wait for its matching reply. Caller must hold self.lock.
+        Returns the reply without its request id, or None on timeout or broken pipe.
+        """
+        if self.conn is None:
+            return None
+
+        self.next_request_id += 1
+        request_id = self.next_request_id
+
+        try:
+            self.conn.send((request_id, kind, payload))
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not self.conn.poll(remaining):
+                    return None
+                reply = self.conn.recv()
+                if reply[0] == request_id:
+                    return reply[1:]
+                # Stale reply to an earlier request; discard it
+        except (EOFError, OSError):
+            return None
+
+    def run_action(self, action, stats):
+        """
+        Execute one window action with a deadline, recording it in stats and the running totals.
+        Time spent waiting for a restart or for the pipe counts against the deadline.
+        Returns (ok, detail, latency_seconds, worker_seconds); detail is a warning or
+        error message, and worker_seconds is None when the worker did not reply.
+        """
+        started = time.perf_counter()
+        deadline = started + self.action_timeout
+        reply = None
+
+        if not self.ready.is_set():
+            self._respawn_async("is not running")
+        if (self.ready.wait(max(0.0, deadline - time.perf_counter()))
+                and self.lock.acquire(timeout=max(0.0, deadline - time.perf_counter()))):
+            try:
+                reply = self._exchange('action', action, deadline)
+            finally:
+                self.lock.release()
+
+        latency = time.perf_counter() - started
+
+        if reply is None:
+            ok, detail, worker_time = False, f"no reply within {self.action_timeout:.1f}s", None
+            self._respawn_async("missed action deadline")
         else:
-            # Click all windows
-            print(f"Debug: No window selection, clicking all windows")
-            windows = valid_windows
-            print(f"\nFound {len(valid_windows)} MapleRoyals window(s)")
+            ok, detail, worker_time = reply
+
+        self.record(stats, ok, latency, worker_time)
+        return ok, detail, latency, worker_time
+
+    def record(self, stats, ok, latency, worker_time):
+        """Add one action to the given tally and to the running totals; worker_time is None on timeout."""
+        for tally in (stats, self.totals):
+            tally['actions'] += 1
+            tally['total_latency'] += latency
+            tally['max_latency'] = max(tally['max_latency'], latency)
+            if worker_time is None:
+                tally['timeouts'] += 1
+                continue
+            tally['total_worker_time'] += worker_time
+            if not ok:
+                tally['failures'] += 1
+
+    def ping(self):
+        """Check that the worker answers; restart it in the background if not."""
+        if self.stop_event.is_set():
+            return
+        if not self.ready.is_set():
+            self._respawn_async("is not running")
+            return
+
+        # An action in flight has its own deadline, so skip the ping rather than wait
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            reply = self._exchange('ping', None, time.perf_counter() + self.watchdog_timeout)
+        finally:
+            self.lock.release()
+
+        if reply is None:
+            self._respawn_async("not responding")
+
+    def _watchdog(self):
+        while not self.stop_event.wait(self.watchdog_interval):
+            try:
+                self.ping()
+            except Exception as e:
+                print(f"\nAutomation watchdog error: {e}")
+
+def get_automation_worker():
+    """Return the running automation worker, starting it on first use."""
+    global automation_worker
+    if automation_worker is None:
+        automation_worker = AutomationWorker()
+        automation_worker.start()
+    return automation_worker
+
+def start_auto_click():
+    """Run click_maple_windows() on its own thread so the timer keeps its schedule."""
+    global auto_click_thread
+
+    if auto_click_thread is not None and auto_click_thread.is_alive():
+        print("\nPrevious auto-click sequence is still running; skipping this one.")
+        return
+
+    auto_click_thread = threading.Thread(target=click_maple_windows, daemon=True)
+    auto_click_thread.start()
+
+def click_maple_windows():
+    """
+    Find and click MapleRoyals windows with human-like timing.
+    Targets windows matching the configured window rules.
+    """
+    if not WINDOW_AUTOMATION_AVAILABLE:
+        print("Window automation not available")
+        return
+
+    try:
+        # Match open windows against the compiled targeting rules
+        windows = window_matcher.filter(gw.getAllWindows())
+
+        if not windows:
+            print("No windows match the targeting rules:")
+            for rule in window_matcher.rules:
+                print(f"  - {describe_window_rule(rule)}")
+            return
+
+        print(f"\nFound {len(windows)} window(s) matching {len(window_matcher.rules)} rule(s)")
 
         print("Starting auto-click sequence...")
 
@@ -336,56 +792,50 @@ def click_maple_windows():
         # Last delay uses remaining time (with a minimum of 0.3s)
         delays.append(max(0.3, remaining_time))
 
+        worker = get_automation_worker()
+        stats = new_automation_stats()
+
         # Click each window
         for i, window in enumerate(windows):
             try:
-                # Use mouse to activate window (more human-like and bypasses API restrictions)
-                try:
-                    # Get window position and size
-                    window_left, window_top, window_width, window_height = window.left, window.top, window.width, window.height
-
-                    # Add random offset to click position (±30% from center)
-                    # This makes it look more human-like
-                    offset_x = int(random.uniform(-0.3, 0.3) * window_width)
-                    offset_y = int(random.uniform(-0.3, 0.3) * window_height)
-
-                    click_x = window_left + window_width // 2 + offset_x
-                    click_y = window_top + window_height // 2 + offset_y
-
-                    # Move mouse to target position with human-like animation
+                # Get window position and size
+                window_left, window_top, window_width, window_height = window.left, window.top, window.width, window.height
+
+                # Add random offset to click position (±30% from center)
+                # This makes it look more human-like
+                offset_x = int(random.uniform(-0.3, 0.3) * window_width)
+                offset_y = int(random.uniform(-0.3, 0.3) * window_height)
+
+                action = {
+                    'handle': window._hWnd,
+                    'x': window_left + window_width // 2 + offset_x,
+                    'y': window_top + window_height // 2 + offset_y,
                     # Random duration between 0.3 to 0.8 seconds for more natural movement
-                    move_duration = random.uniform(0.3, 0.8)
-                    pyautogui.moveTo(click_x, click_y, duration=move_duration)
-                    
-                    # Small pause after movement (human reaction time)
-                    time.sleep(random.uniform(0.05, 0.15))
-                    
-                    # Click on the position (mouse is already there)
-                    pyautogui.click()
-                    time.sleep(0.2)  # Wait for window to become active
-
-                except Exception:
-                    # If mouse click fails, try API activate as fallback
-                    try:
-                        window.activate()
-                        time.sleep(0.15)
-                    except:
-                        print(f"  [{i+1}/{num_windows}] Warning: Could not activate '{window.title}', sending keypress anyway")
-
-                # Press the trigger key
-                keyboard.press_and_release(config['trigger_key'])
-
-                print(f"  [{i+1}/{num_windows}] Clicked: {window.title}")
-
-                # Wait before next window (except for the last one)
-                if i < len(delays):
-                    time.sleep(delays[i])
+                    'move_duration': random.uniform(0.3, 0.8),
+                    'pause': random.uniform(0.05, 0.15),
+                    'trigger_key': config['trigger_key'],
+                }
+
+                # Run the action in the worker process so a stall only costs the action deadline
+                ok, detail, latency, worker_time = worker.run_action(action, stats)
+
+                if ok:
+                    if detail:
+                        print(f"  [{i+1}/{num_windows}] Warning: {detail} ('{window.title}')")
+                    print(f"  [{i+1}/{num_windows}] Clicked: {window.title} ({latency:.2f}s, {worker_time:.2f}s in worker)")
+                else:
+                    print(f"  [{i+1}/{num_windows}] Error with '{window.title}': {str(detail)[:50]}... (skipped)")
 
             except Exception as e:
                 print(f"  [{i+1}/{num_windows}] Error with '{window.title}': {str(e)[:50]}... (skipped)")
-                continue
+
+            # Wait before next window (except for the last one)
+            if i < len(delays):
+                time.sleep(delays[i])
 
         print("Auto-click sequence completed")
+        print(f"Automation stats: {format_automation_stats(stats)}")
+        print(f"Automation totals: {format_automation_stats(worker.totals)}, {worker.restarts} worker restart(s)")
 
     except Exception as e:
         print(f"Error in click_maple_windows: {e}")
@@ -434,7 +884,7 @@ def on_timeout():
     # Execute auto-click if enabled
     if config.get('auto_click_windows', False):
         print("\nAuto-click is enabled. Clicking MapleRoyals windows...")
-        click_maple_windows()
+        start_auto_click()
 
     # Auto-restart countdown with ESC to cancel
     print("\n" + "="*50)
@@ -473,7 +923,7 @@ def on_timeout():
             unregister_hotkeys()
             new_config = setup_config()
             if new_config:
-                config = new_config
+                set_config(new_config)
                 save_config(config)
                 print("\nConfiguration updated successfully!")
             else:
@@ -579,7 +1029,7 @@ def command_listener():
                 new_config = setup_config()
 
                 if new_config:
-                    config = new_config
+                    set_config(new_config)
                     save_config(config)
                     print("\nConfiguration updated successfully!")
                 else:
@@ -618,13 +1068,10 @@ def main():
         print(f"  Auto-click MapleRoyals: {auto_click_status}")
 
         if existing_config.get('auto_click_windows', False):
-            selected_titles = existing_config.get('selected_window_titles')
-            if selected_titles:
-                print(f"  Selected windows ({len(selected_titles)}):")
-                for title in selected_titles:
-                    print(f"    - {title}")
-            else:
-                print(f"  Mode: Click all windows")
+            window_rules = existing_config['window_rules']
+            print(f"  Window rules ({len(window_rules)}):")
+            for rule in window_rules:
+                print(f"    - {describe_window_rule(rule)}")
 
         print("\nDo you want to reconfigure? (Type '/setup' or press Enter to skip): ", end='', flush=True)
 
@@ -633,37 +1080,29 @@ def main():
         if choice == '/setup':
             new_config = setup_config()
             if new_config:
-                config = new_config
+                set_config(new_config)
                 save_config(config)
             else:
                 print("Using existing configuration...")
-                config = existing_config
+                set_config(existing_config)
         else:
-            config = existing_config
+            set_config(existing_config)
     else:
         print("No configuration found. Please set up your keys.\n")
         new_config = setup_config()
 
         if new_config:
-            config = new_config
+            set_config(new_config)
             save_config(config)
         else:
             print("Setup failed. Using defaults.")
-            config = {
+            set_config({
                 'trigger_key': DEFAULT_TRIGGER_KEY,
                 'stop_key': DEFAULT_STOP_KEY,
                 'countdown_seconds': DEFAULT_COUNTDOWN_SECONDS,
                 'auto_click_windows': DEFAULT_AUTO_CLICK_WINDOWS,
-                'selected_window_titles': None
-            }
-
-    # Ensure auto_click_windows exists in config (for backwards compatibility)
-    if 'auto_click_windows' not in config:
-        config['auto_click_windows'] = DEFAULT_AUTO_CLICK_WINDOWS
-
-    # Ensure selected_window_titles exists in config (for backwards compatibility)
-    if 'selected_window_titles' not in config:
-        config['selected_window_titles'] = None
+                'window_rules': default_window_rules()
+            })
 
     print(f"\n=== Program started ===")
     print(f"Press [{config['trigger_key']}] to START/RESET")
@@ -671,17 +1110,17 @@ def main():
     print(f"Countdown: {config['countdown_seconds']} seconds")
     if config.get('auto_click_windows', False):
         print("Auto-click MapleRoyals: ENABLED")
-        selected_titles = config.get('selected_window_titles')
-        if selected_titles:
-            print(f"  Selected {len(selected_titles)} specific window(s)")
-        else:
-            print(f"  Mode: Click all windows")
+        print(f"  Targeting {len(window_matcher.rules)} window rule(s)")
     else:
         print("Auto-click MapleRoyals: DISABLED")
     print("Type '/setup' to reconfigure\n")
 
     register_hotkeys()
 
+    # Start the automation worker early so the first auto-click doesn't pay the spawn cost
+    if WINDOW_AUTOMATION_AVAILABLE and config.get('auto_click_windows', False):
+        get_automation_worker()
+
     # Start command listener in a daemon thread
     listener_thread = threading.Thread(target=command_listener, daemon=True)
     listener_thread.start()
@@ -691,6 +1130,11 @@ def main():
             time.sleep(1)
     except KeyboardInterrupt:
         print("\nProgram terminated.")
+    finally:
+        if automation_worker is not None:
+            automation_worker.stop()
 
 if __name__ == "__main__":
+    # Required for multiprocessing in a PyInstaller-frozen executable
+    multiprocessing.freeze_support()
     main()